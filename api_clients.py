@@ -1,21 +1,166 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import http.client
+import itertools
 import json
 import os
+import random
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any, Dict, Optional
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 MODEL = "mistral-ocr-latest"
 OCR_ENDPOINT = "https://api.mistral.ai/v1/ocr"
+FILES_ENDPOINT = "https://api.mistral.ai/v1/files"
 TMDB_API_BASE = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p"
+TMDB_LANGUAGE = "fr-FR"
+
+# TMDB metadata changes over days or weeks, so lookups are cached on disk.
+TMDB_CACHE_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "cinema-morvan",
+    "tmdb.json",
+)
+TMDB_CACHE_TTL = 15 * 24 * 3600
+# Overrides TMDB_CACHE_TTL, in days; 0 disables the cache.
+TMDB_CACHE_TTL_ENV = "TMDB_CACHE_TTL_DAYS"
+
+# TMDB lookups are network-bound; threads overlap their round trips.
+TMDB_MAX_WORKERS = 8
+
+# Socket timeouts in seconds. OCR of a long programme legitimately takes a while.
+TMDB_TIMEOUT = 10.0
+OCR_TIMEOUT = 300.0
+FILES_TIMEOUT = 30.0
+
+# Transient failures (rate limiting, overloaded upstreams, dropped
+# connections) are retried with exponential backoff and jitter.
+HTTP_RETRY_ATTEMPTS = 5
+HTTP_RETRY_BASE_DELAY = 0.5
+HTTP_RETRY_MAX_DELAY = 30.0
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Read size when streaming the PDF into the upload request.
+PDF_CHUNK_SIZE = 3 * 64 * 1024
+
+# One keep-alive connection per host and thread; http.client connections
+# are not thread-safe, so they are never shared across threads.
+_CONNECTIONS = threading.local()
+
+_DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "cinema-morvan/1.0",
+}
+
+
+_TMDB_CACHE_LOCK = threading.Lock()
+_tmdb_cache: Optional[Dict[str, Any]] = None
 
 
-def load_pdf_base64(path: str) -> str:
+@dataclass(frozen=True, slots=True)
+class TmdbDetails:
+    original_title: Optional[str] = None
+    original_language: Optional[str] = None
+    yt_trailer_url: Optional[str] = None
+    director: Optional[str] = None
+    cast: Optional[str] = None
+    genre: Optional[str] = None
+    duration: Optional[str] = None
+    blurb: Optional[str] = None
+    release_date: Optional[str] = None
+    poster_url: Optional[str] = None
+    poster_url_w780: Optional[str] = None
+    backdrop_url: Optional[str] = None
+    source: Optional[str] = None
+
+
+# Returned when nothing could be found; immutable, so safe to share.
+_TMDB_EMPTY = TmdbDetails()
+
+_TMDB_FIELDS = frozenset(f.name for f in fields(TmdbDetails))
+
+
+def _json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def iter_file_chunks(path: str) -> Iterator[bytes]:
     with open(path, "rb") as handle:
-        return base64.b64encode(handle.read()).decode("ascii")
+        while True:
+            chunk = handle.read(PDF_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _upload_request_body(pdf_path: str, boundary: str) -> Tuple[Iterable[bytes], int]:
+    # multipart/form-data with the raw PDF streamed between the part headers,
+    # so the document is neither base64-inflated nor held in memory whole.
+    filename = os.path.basename(pdf_path).replace('"', "%22")
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+        "ocr\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+    body = itertools.chain((head,), iter_file_chunks(pdf_path), (tail,))
+    return body, len(head) + os.path.getsize(pdf_path) + len(tail)
+
+
+def upload_ocr_file(pdf_path: str, api_key: str) -> str:
+    boundary = f"cinema-morvan-{uuid.uuid4().hex}"
+    _, body_length = _upload_request_body(pdf_path, boundary)
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(body_length),
+    }
+
+    def send() -> bytes:
+        # The streamed body is single-use, so each attempt rebuilds it.
+        body, _ = _upload_request_body(pdf_path, boundary)
+        return _http_request("POST", FILES_ENDPOINT, body=body, headers=headers, timeout=OCR_TIMEOUT)
+
+    return _json_loads(_with_retry(send))["id"]
+
+
+def _delete_ocr_file(file_id: str, api_key: str) -> None:
+    try:
+        _http_request(
+            "DELETE",
+            f"{FILES_ENDPOINT}/{urllib.parse.quote(file_id)}",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=FILES_TIMEOUT,
+        )
+    except (OSError, http.client.HTTPException):
+        # Clean-up only; the OCR result is already in hand.
+        pass
 
 
 def call_mistral_ocr(pdf_path: str, include_image_base64: bool = False) -> Dict[str, Any]:
@@ -23,37 +168,151 @@ def call_mistral_ocr(pdf_path: str, include_image_base64: bool = False) -> Dict[
     if not api_key:
         raise RuntimeError("MISTRAL_API_KEY is required")
 
-    pdf_b64 = load_pdf_base64(pdf_path)
-    payload = {
-        "model": MODEL,
-        "document": {
-            "type": "document_url",
-            "document_url": f"data:application/pdf;base64,{pdf_b64}",
-        },
-        "include_image_base64": bool(include_image_base64),
-    }
-
-    body = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        OCR_ENDPOINT,
-        data=body,
-        headers={
+    # Upload once, then reference the file: an OCR retry does not resend the PDF.
+    file_id = upload_ocr_file(pdf_path, api_key)
+    try:
+        body = _json_dumps(
+            {
+                "model": MODEL,
+                "document": {"type": "file", "file_id": file_id},
+                "include_image_base64": bool(include_image_base64),
+            }
+        )
+        headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
-        },
-        method="POST",
-    )
+        }
+        raw = _with_retry(
+            lambda: _http_request("POST", OCR_ENDPOINT, body=body, headers=headers, timeout=OCR_TIMEOUT)
+        )
+    finally:
+        _delete_ocr_file(file_id, api_key)
+    return _json_loads(raw)
+
 
-    with urllib.request.urlopen(req) as resp:
-        raw = resp.read().decode("utf-8")
-    return json.loads(raw)
+def _get_connection(host: str) -> http.client.HTTPSConnection:
+    pool = getattr(_CONNECTIONS, "pool", None)
+    if pool is None:
+        pool = _CONNECTIONS.pool = {}
+    conn = pool.get(host)
+    if conn is None:
+        conn = pool[host] = _new_connection(host)
+    return conn
+
+
+def _new_connection(host: str) -> http.client.HTTPSConnection:
+    # Honour HTTPS_PROXY / NO_PROXY as urllib's default ProxyHandler does,
+    # tunnelling TLS through the proxy with CONNECT.
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return http.client.HTTPSConnection(host)
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    tunnel_headers = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+    conn = http.client.HTTPSConnection(parts.hostname, parts.port or 80)
+    conn.set_tunnel(host, headers=tunnel_headers)
+    return conn
+
+
+def _http_request(
+    method: str,
+    url: str,
+    body: Optional[Union[bytes, Iterable[bytes]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> bytes:
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = {**_DEFAULT_HEADERS, **(headers or {})}
+    conn = _get_connection(parts.netloc)
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    # A reused socket may have been closed by the server while idle; bodiless
+    # requests are replayed once on a fresh connection in that case.
+    attempts = 2 if body is None else 1
+    for attempt in range(attempts):
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+            break
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if attempt == attempts - 1:
+                raise
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+    if resp.will_close:
+        conn.close()
+    # Redirects are not followed: neither API redirects its endpoints, and
+    # silently re-sending an OCR POST elsewhere is not wanted either.
+    if resp.status >= 300:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return _decode_content(raw, resp.getheader("Content-Encoding"))
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    retry_after = None
+    if isinstance(error, urllib.error.HTTPError) and error.headers is not None:
+        retry_after = error.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), HTTP_RETRY_MAX_DELAY)
+        except ValueError:
+            # HTTP-date form; fall back to the regular backoff.
+            pass
+    delay = HTTP_RETRY_BASE_DELAY * (2 ** attempt) + random.random() * 0.1
+    return min(delay, HTTP_RETRY_MAX_DELAY)
+
+
+def _with_retry(
+    send: Callable[[], bytes],
+    attempts: int = HTTP_RETRY_ATTEMPTS,
+    retry_timeouts: bool = False,
+) -> bytes:
+    # Only dropped connections and the listed statuses are retried; other
+    # errors (TLS verification, DNS) would fail again. Timeouts are opt-in:
+    # re-sending a billed OCR request after OCR_TIMEOUT is never worth it.
+    retryable: Tuple[type, ...] = (ConnectionError, http.client.RemoteDisconnected)
+    if retry_timeouts:
+        retryable += (TimeoutError,)
+    for attempt in range(attempts - 1):
+        try:
+            return send()
+        except urllib.error.HTTPError as exc:
+            if exc.code not in HTTP_RETRY_STATUSES:
+                raise
+            time.sleep(_retry_delay(attempt, exc))
+        except retryable as exc:
+            time.sleep(_retry_delay(attempt, exc))
+    return send()
+
+
+def _decode_content(raw: bytes, encoding: Optional[str]) -> bytes:
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return zlib.decompress(raw, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header.
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    return raw
 
 
 def _http_get_json(url: str) -> Dict[str, Any]:
-    req = urllib.request.Request(url, method="GET")
-    with urllib.request.urlopen(req) as resp:
-        raw = resp.read().decode("utf-8")
-    return json.loads(raw)
+    # TMDB lookups are idempotent GETs with a short timeout, safe to repeat.
+    return _json_loads(
+        _with_retry(lambda: _http_request("GET", url, timeout=TMDB_TIMEOUT), retry_timeouts=True)
+    )
 
 
 def _pick_trailer_url(videos_payload: Dict[str, Any]) -> Optional[str]:
@@ -92,83 +351,110 @@ def _format_duration(minutes: Optional[int]) -> Optional[str]:
     return f"{h}h"
 
 
-def fetch_tmdb_details(title: str, api_key: str) -> Dict[str, Optional[str]]:
+def _tmdb_cache_key(title: str, language: str) -> str:
+    # TMDB search ignores case and spacing, so OCR variants of a title share
+    # one entry ("CHASSE  GARDÉE 2" and "Chasse gardée 2").
+    normalized = " ".join(title.split()).casefold()
+    return hashlib.blake2b(f"{language}\0{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_tmdb_cache() -> Dict[str, Any]:
+    # Callers must hold _TMDB_CACHE_LOCK.
+    global _tmdb_cache
+    if _tmdb_cache is None:
+        try:
+            with open(TMDB_CACHE_PATH, "rb") as handle:
+                loaded = _json_loads(handle.read())
+        except (OSError, ValueError):
+            loaded = None
+        _tmdb_cache = loaded if isinstance(loaded, dict) else {}
+    return _tmdb_cache
+
+
+def _tmdb_cache_ttl() -> float:
+    # Read at call time: .env is only loaded once ocr.mistral is imported.
+    raw = os.getenv(TMDB_CACHE_TTL_ENV, "").strip()
+    if raw:
+        try:
+            return float(raw) * 24 * 3600
+        except ValueError:
+            pass
+    return TMDB_CACHE_TTL
+
+
+def _tmdb_cache_get(title: str, language: str) -> Optional[TmdbDetails]:
+    ttl = _tmdb_cache_ttl()
+    if ttl <= 0:
+        return None
+    with _TMDB_CACHE_LOCK:
+        entry = _load_tmdb_cache().get(_tmdb_cache_key(title, language))
+    if not isinstance(entry, dict):
+        return None
+    fetched_at = entry.get("fetched_at")
+    data = entry.get("data")
+    if not isinstance(fetched_at, (int, float)) or not isinstance(data, dict):
+        return None
+    if time.time() - fetched_at >= ttl:
+        return None
+    return TmdbDetails(**{k: v for k, v in data.items() if k in _TMDB_FIELDS})
+
+
+def _tmdb_cache_put(title: str, language: str, details: TmdbDetails) -> None:
+    if _tmdb_cache_ttl() <= 0:
+        return
+    with _TMDB_CACHE_LOCK:
+        cache = _load_tmdb_cache()
+        cache[_tmdb_cache_key(title, language)] = {"fetched_at": time.time(), "data": asdict(details)}
+        tmp_path = f"{TMDB_CACHE_PATH}.tmp"
+        try:
+            os.makedirs(os.path.dirname(TMDB_CACHE_PATH), exist_ok=True)
+            with open(tmp_path, "wb") as handle:
+                handle.write(_json_dumps(cache))
+            os.replace(tmp_path, TMDB_CACHE_PATH)
+        except OSError:
+            # The cache is an optimization; a read-only home must not fail the run.
+            return
+
+
+def fetch_tmdb_details(
+    title: str,
+    api_key: str,
+    include_credits: bool = True,
+) -> TmdbDetails:
+    """
+    Look up a title on TMDB.
+
+    With include_credits=False the details request skips the credits block
+    (the bulk of the payload) and director/cast are left as None.
+    """
     if not title:
-        return {
-            "original_title": None,
-            "original_language": None,
-            "yt_trailer_url": None,
-            "director": None,
-            "cast": None,
-            "genre": None,
-            "duration": None,
-            "blurb": None,
-            "release_date": None,
-            "poster_url": None,
-            "poster_url_w780": None,
-            "backdrop_url": None,
-            "source": None,
-        }
+        return _TMDB_EMPTY
+
+    # Results without credits are cached apart; a full result serves both.
+    cache_variant = TMDB_LANGUAGE if include_credits else f"{TMDB_LANGUAGE}+nocredits"
+    cached = _tmdb_cache_get(title, TMDB_LANGUAGE)
+    if cached is None and not include_credits:
+        cached = _tmdb_cache_get(title, cache_variant)
+    if cached is not None:
+        return cached
 
     query = urllib.parse.quote(title)
     search_url = (
         f"{TMDB_API_BASE}/search/movie?api_key={api_key}"
-        f"&query={query}&include_adult=false&language=fr-FR"
+        f"&query={query}&include_adult=false&language={TMDB_LANGUAGE}"
     )
     try:
         payload = _http_get_json(search_url)
     except Exception:
-        return {
-            "original_title": None,
-            "original_language": None,
-            "yt_trailer_url": None,
-            "director": None,
-            "cast": None,
-            "genre": None,
-            "duration": None,
-            "blurb": None,
-            "release_date": None,
-            "poster_url": None,
-            "poster_url_w780": None,
-            "backdrop_url": None,
-            "source": None,
-        }
+        return _TMDB_EMPTY
 
     results = payload.get("results") or []
     if not results:
-        return {
-            "original_title": None,
-            "original_language": None,
-            "yt_trailer_url": None,
-            "director": None,
-            "cast": None,
-            "genre": None,
-            "duration": None,
-            "blurb": None,
-            "release_date": None,
-            "poster_url": None,
-            "poster_url_w780": None,
-            "backdrop_url": None,
-            "source": None,
-        }
+        return _TMDB_EMPTY
 
     first = results[0]
     if not isinstance(first, dict):
-        return {
-            "original_title": None,
-            "original_language": None,
-            "yt_trailer_url": None,
-            "director": None,
-            "cast": None,
-            "genre": None,
-            "duration": None,
-            "blurb": None,
-            "release_date": None,
-            "poster_url": None,
-            "poster_url_w780": None,
-            "backdrop_url": None,
-            "source": None,
-        }
+        return _TMDB_EMPTY
 
     movie_id = first.get("id")
     original_title = first.get("original_title")
@@ -183,12 +469,14 @@ def fetch_tmdb_details(title: str, api_key: str) -> Dict[str, Optional[str]]:
     poster_url = None
     poster_url_w780 = None
     backdrop_url = None
+    details_ok = True
 
     if movie_id:
         try:
+            append = "credits,videos" if include_credits else "videos"
             details_url = (
                 f"{TMDB_API_BASE}/movie/{movie_id}?api_key={api_key}"
-                f"&language=fr-FR&append_to_response=credits,videos"
+                f"&language={TMDB_LANGUAGE}&append_to_response={append}"
             )
             details = _http_get_json(details_url)
             videos_payload = details.get("videos") or {}
@@ -217,19 +505,42 @@ def fetch_tmdb_details(title: str, api_key: str) -> Dict[str, Optional[str]]:
                 cast = ", ".join(top_cast)
         except Exception:
             trailer_url = None
+            details_ok = False
 
-    return {
-        "original_title": original_title,
-        "original_language": original_language,
-        "yt_trailer_url": trailer_url,
-        "director": director,
-        "cast": cast,
-        "genre": genre,
-        "duration": duration,
-        "blurb": blurb,
-        "release_date": release_date,
-        "poster_url": poster_url,
-        "poster_url_w780": poster_url_w780,
-        "backdrop_url": backdrop_url,
-        "source": "tmdb",
-    }
+    info = TmdbDetails(
+        original_title=original_title,
+        original_language=original_language,
+        yt_trailer_url=trailer_url,
+        director=director,
+        cast=cast,
+        genre=genre,
+        duration=duration,
+        blurb=blurb,
+        release_date=release_date,
+        poster_url=poster_url,
+        poster_url_w780=poster_url_w780,
+        backdrop_url=backdrop_url,
+        source="tmdb",
+    )
+    if details_ok:
+        # Partial results from a failed details call are not worth keeping.
+        _tmdb_cache_put(title, cache_variant, info)
+    return info
+
+
+def fetch_tmdb_details_many(
+    titles: Iterable[str],
+    api_key: str,
+    max_workers: int = TMDB_MAX_WORKERS,
+    without_credits: Container[str] = frozenset(),
+) -> Dict[str, TmdbDetails]:
+    unique_titles = list(dict.fromkeys(titles))
+    if not unique_titles:
+        return {}
+
+    def fetch(title: str) -> TmdbDetails:
+        return fetch_tmdb_details(title, api_key, include_credits=title not in without_credits)
+
+    workers = max(1, min(max_workers, len(unique_titles)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(unique_titles, pool.map(fetch, unique_titles)))
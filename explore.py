@@ -1,13 +1,21 @@
 import pdfplumber
 from PIL import ImageDraw
 
-with pdfplumber.open("INTERNET-MORVAN.pdf") as pdf:
-    page = pdf.pages[1]
-    im = page.to_image(resolution=150)
-    draw = ImageDraw.Draw(im.original)
+DEBUG_IMAGE_PATH = "/tmp/debug.png"
 
-    for w in page.extract_words():
-        draw.rectangle([w["x0"], w["top"], w["x1"], w["bottom"]], outline="red")
 
-    im.show()
+def main() -> None:
+    with pdfplumber.open("INTERNET-MORVAN.pdf") as pdf:
+        page = pdf.pages[1]
+        # PDF coordinates are in points, so 72 DPI keeps word boxes aligned.
+        im = page.to_image(resolution=72)
+        draw = ImageDraw.Draw(im.original)
 
+        for w in page.extract_words():
+            draw.rectangle([w["x0"], w["top"], w["x1"], w["bottom"]], outline="red")
+
+        im.original.save(DEBUG_IMAGE_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,41 +3,109 @@ from __future__ import annotations
 import re
 import unicodedata
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from api_clients import fetch_tmdb_details
+from api_clients import TmdbDetails, fetch_tmdb_details_many
 from parsing.screenings import Screening
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
 
+MATCH_THRESHOLD = 0.85
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_DURATION_RE = re.compile(r"\b\d+h(\d{2})?\b")
+
+# Folds the accented letters and typographic punctuation found in French
+# titles exactly as NFKD + combining-mark removal + _NON_ALNUM_RE would,
+# so the Unicode pass only runs for the rare leftovers.
+_ASCII_FOLD = str.maketrans({
+    **dict(zip("àâäáãåçèéêëìíîïñòóôõöùúûüýÿ", "aaaaaaceeeeiiiinooooouuuuyy")),
+    **dict.fromkeys("\u00a0\u202f\u2018\u2019«»\u2013\u2014…", " "),
+})
+
+# Letters counted by the uppercase-ratio title heuristic.
+_TITLE_LETTERS = frozenset(
+    ch for ch in map(chr, range(0x100)) if re.match(r"[A-Za-zÀ-ÖØ-öø-ÿ]", ch)
+)
+_TITLE_UPPER_LETTERS = frozenset(ch for ch in _TITLE_LETTERS if ch.isupper())
+
+# Section headings that look like titles but never introduce a movie.
+_IGNORED_HEADINGS = frozenset({
+    "DOCUMENTAIRES",
+    "ÉVÉNEMENTS",
+    "EVENEMENTS",
+    "JEUNE PUBLIC & EN FAMILLE",
+    "JEUNE PUBLIC",
+    "CIN'ESPIÈGLE",
+    "CIN'ESPIEGLE",
+    "CINÉ-CONCERT",
+    "CINE-CONCERT",
+    "LES PIONNIERS DU CINEMA",
+    "LES PIONNIERS DU CINÉMA",
+    "CLAP CLASSIC",
+    "SEANCE PATRIMOINE",
+    "FAITS DIVERS",
+    "AVANT PREMIERE",
+    "AVANT PREMIÈRE",
+})
+
+
+@lru_cache(maxsize=2048)
 def _normalize_for_match(text: str) -> str:
     if not text:
         return ""
-    text = text.lower()
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+    text = text.lower().translate(_ASCII_FOLD)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    # Every run of non-alphanumerics (whitespace included) becomes one space.
+    return _NON_ALNUM_RE.sub(" ", text).strip()
+
+
+def _normalize_candidates(candidates: List[str]) -> List[Tuple[str, str]]:
+    return [(cand, _normalize_for_match(cand)) for cand in candidates]
+
 
+def _similarity(a: str, b: str, score_cutoff: float) -> float:
+    # Scores below score_cutoff may be reported as 0.0.
+    if fuzz is not None:
+        # fuzz.ratio is 2*LCS/T, while difflib counts matching blocks, which
+        # form a common subsequence: fuzz.ratio >= ratio(). It only serves as
+        # a fast reject (with slack for float rounding at the cutoff), so the
+        # score, and every match, is difflib's with or without rapidfuzz.
+        if not fuzz.ratio(a, b, score_cutoff=score_cutoff * 100 - 1e-6):
+            return 0.0
+        return SequenceMatcher(None, a, b).ratio()
+    matcher = SequenceMatcher(None, a, b)
+    # Both quick ratios are upper bounds on ratio(); the length-only one is O(1).
+    if matcher.real_quick_ratio() < score_cutoff or matcher.quick_ratio() < score_cutoff:
+        return 0.0
+    return matcher.ratio()
 
-def _best_match_title(target: str, candidates: List[str]) -> Optional[str]:
+
+def _best_match_title(target: str, candidates: List[Tuple[str, str]]) -> Optional[str]:
+    # Candidates are (original, normalized) pairs from _normalize_candidates.
     if not target or not candidates:
         return None
     target_norm = _normalize_for_match(target)
     best = None
     best_score = 0.0
-    for cand in candidates:
-        cand_norm = _normalize_for_match(cand)
+    for cand, cand_norm in candidates:
         if not cand_norm:
             continue
         if target_norm == cand_norm:
             return cand
-        score = SequenceMatcher(None, target_norm, cand_norm).ratio()
+        score = _similarity(target_norm, cand_norm, max(best_score, MATCH_THRESHOLD))
         if target_norm in cand_norm or cand_norm in target_norm:
             score = max(score, 0.9)
         if score > best_score:
             best_score = score
             best = cand
-    if best_score >= 0.85:
+    if best_score >= MATCH_THRESHOLD:
         return best
     return None
 
@@ -47,48 +115,36 @@ def _is_title_candidate(line: str) -> bool:
         return False
     stripped = line.strip()
     stripped = stripped.lstrip("# ").strip()
-    if not stripped:
+    # Cheapest rejections first; every check only ever returns False.
+    if len(stripped) < 3:
         return False
-    if "|" in stripped:
+    if "|" in stripped or "€" in stripped:
         return False
     if stripped.startswith("!["):
         return False
-    if stripped.lower().startswith(("de ", "avec ")):
-        return False
-    if "http" in stripped.lower() or "www." in stripped.lower():
-        return False
-    if "€" in stripped:
+    lowered = stripped.lower()
+    if lowered.startswith(("de ", "avec ")):
         return False
-    if len(stripped) < 3:
+    if "http" in lowered or "www." in lowered:
         return False
-    ignore = {
-        "DOCUMENTAIRES",
-        "ÉVÉNEMENTS",
-        "EVENEMENTS",
-        "JEUNE PUBLIC & EN FAMILLE",
-        "JEUNE PUBLIC",
-        "CIN'ESPIÈGLE",
-        "CIN'ESPIEGLE",
-        "CINÉ-CONCERT",
-        "CINE-CONCERT",
-        "LES PIONNIERS DU CINEMA",
-        "LES PIONNIERS DU CINÉMA",
-        "CLAP CLASSIC",
-        "SEANCE PATRIMOINE",
-        "SEANCE PATRIMOINE",
-        "FAITS DIVERS",
-        "AVANT PREMIERE",
-        "AVANT PREMIÈRE",
-    }
-    upper = stripped.upper()
-    if upper in ignore or upper.startswith("AVANT PREMI"):
+    heading = stripped.upper()
+    if heading in _IGNORED_HEADINGS or heading.startswith("AVANT PREMI"):
         return False
-    letters = re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ]", stripped)
-    if not letters:
+    # Titles are mostly uppercase: at least 60% of letters (upper * 2 >= lower * 3).
+    upper = lower = 0
+    remaining = len(stripped)
+    for ch in stripped:
+        remaining -= 1
+        if ch in _TITLE_UPPER_LETTERS:
+            upper += 1
+        elif ch in _TITLE_LETTERS:
+            lower += 1
+            # Even if every remaining char were uppercase, 60% is out of reach.
+            if lower * 3 > (upper + remaining) * 2:
+                return False
+    if not upper:
         return False
-    upper_letters = [ch for ch in letters if ch.isupper()]
-    ratio = len(upper_letters) / max(1, len(letters))
-    return ratio >= 0.6
+    return upper * 2 >= lower * 3
 
 
 def _parse_meta_line(line: str) -> Dict[str, Optional[str]]:
@@ -96,7 +152,6 @@ def _parse_meta_line(line: str) -> Dict[str, Optional[str]]:
     if not line:
         return meta
     parts = [p.strip() for p in line.split(" - ") if p.strip()]
-    duration_re = re.compile(r"\b\d+h(\d{2})?\b")
     for part in parts:
         if part.startswith("De "):
             meta["director"] = part.replace("De ", "").strip()
@@ -104,20 +159,30 @@ def _parse_meta_line(line: str) -> Dict[str, Optional[str]]:
         if part.startswith("Avec "):
             meta["cast"] = part.replace("Avec ", "").strip()
             continue
-        if duration_re.search(part):
-            meta["duration"] = duration_re.search(part).group(0)
-            continue
-    # Genre is typically the last non-duration, non-credit part
-    for part in reversed(parts):
-        if part.startswith("De ") or part.startswith("Avec "):
-            continue
-        if duration_re.search(part):
+        duration = _DURATION_RE.search(part)
+        if duration:
+            meta["duration"] = duration.group(0)
             continue
+        # Genre is typically the last non-duration, non-credit part
         meta["genre"] = part
-        break
     return meta
 
 
+def _flush_blurb(
+    blurbs: Dict[str, Dict[str, Optional[str]]],
+    title: str,
+    meta: str,
+    buffer: List[str],
+) -> None:
+    blurbs[title] = {
+        "title": title,
+        "meta_raw": meta,
+        "blurb": " ".join(buffer) or None,
+        **_parse_meta_line(meta),
+        "source": "pdf",
+    }
+
+
 def extract_movie_blurbs(texts: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
     blurbs: Dict[str, Dict[str, Optional[str]]] = {}
     for page_text in texts:
@@ -138,13 +203,7 @@ def extract_movie_blurbs(texts: List[str]) -> Dict[str, Dict[str, Optional[str]]
                 continue
             if _is_title_candidate(line):
                 if current_title and current_meta:
-                    blurbs[current_title] = {
-                        "title": current_title,
-                        "meta_raw": current_meta,
-                        "blurb": " ".join(buffer).strip() if buffer else None,
-                        **(_parse_meta_line(current_meta) if current_meta else {}),
-                        "source": "pdf",
-                    }
+                    _flush_blurb(blurbs, current_title, current_meta, buffer)
                 current_title = line.lstrip("# ").strip()
                 current_meta = None
                 buffer = []
@@ -155,53 +214,71 @@ def extract_movie_blurbs(texts: List[str]) -> Dict[str, Dict[str, Optional[str]]
                 else:
                     buffer.append(line)
         if current_title and current_meta:
-            blurbs[current_title] = {
-                "title": current_title,
-                "meta_raw": current_meta,
-                "blurb": " ".join(buffer).strip() if buffer else None,
-                **(_parse_meta_line(current_meta) if current_meta else {}),
-                "source": "pdf",
-            }
+            _flush_blurb(blurbs, current_title, current_meta, buffer)
     return blurbs
 
 
+def screening_titles(screenings: List[Screening]) -> List[str]:
+    # First-appearance order: deterministic and follows the PDF programme.
+    return list(dict.fromkeys(s.movie_title for s in screenings if s.movie_title))
+
+
+def match_movie_blurbs(
+    texts: List[str],
+    titles: List[str],
+) -> Dict[str, Dict[str, Optional[str]]]:
+    blurbs = extract_movie_blurbs(texts)
+    blurb_titles = _normalize_candidates(list(blurbs.keys()))
+
+    matched_blurbs: Dict[str, Dict[str, Optional[str]]] = {}
+    for title in titles:
+        matched = _best_match_title(title, blurb_titles)
+        if matched:
+            matched_blurbs[title] = blurbs[matched]
+    return matched_blurbs
+
+
 def build_movies_from_texts(
     texts: List[str],
     screenings: List[Screening],
     tmdb_key: str,
+    matched_blurbs: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+    tmdb_details: Optional[Dict[str, TmdbDetails]] = None,
 ) -> List[Dict[str, Any]]:
-    screening_titles = sorted({s.movie_title for s in screenings if s.movie_title})
-
-    blurbs = extract_movie_blurbs(texts)
-    blurb_titles = list(blurbs.keys())
+    titles = screening_titles(screenings)
+    if matched_blurbs is None:
+        matched_blurbs = match_movie_blurbs(texts, titles)
 
-    tmdb_cache: Dict[str, Dict[str, Optional[str]]] = {}
+    if tmdb_details is None:
+        tmdb_details = {}
+        if tmdb_key:
+            # Credits are only read when the PDF has no blurb for the title.
+            tmdb_details = fetch_tmdb_details_many(
+                titles,
+                tmdb_key,
+                without_credits=matched_blurbs.keys(),
+            )
 
     movies: List[Dict[str, Any]] = []
-    for title in screening_titles:
-        matched = _best_match_title(title, blurb_titles)
-        blurb_info = blurbs.get(matched) if matched else None
-        tmdb_info: Dict[str, Optional[str]] = {}
-        if tmdb_key:
-            if title not in tmdb_cache:
-                tmdb_cache[title] = fetch_tmdb_details(title, tmdb_key)
-            tmdb_info = tmdb_cache[title]
+    for title in titles:
+        blurb_info = matched_blurbs.get(title)
+        tmdb_info = tmdb_details.get(title) or TmdbDetails()
 
         entry: Dict[str, Any] = {
             "movie_title": title,
-            "original_title": tmdb_info.get("original_title"),
-            "original_language": tmdb_info.get("original_language"),
+            "original_title": tmdb_info.original_title,
+            "original_language": tmdb_info.original_language,
             "director": None,
             "cast": None,
             "genre": None,
             "duration": None,
             "blurb": None,
             "source": None,
-            "yt_trailer_url": tmdb_info.get("yt_trailer_url"),
-            "release_date": tmdb_info.get("release_date"),
-            "poster_url": tmdb_info.get("poster_url"),
-            "poster_url_w780": tmdb_info.get("poster_url_w780"),
-            "backdrop_url": tmdb_info.get("backdrop_url"),
+            "yt_trailer_url": tmdb_info.yt_trailer_url,
+            "release_date": tmdb_info.release_date,
+            "poster_url": tmdb_info.poster_url,
+            "poster_url_w780": tmdb_info.poster_url_w780,
+            "backdrop_url": tmdb_info.backdrop_url,
         }
 
         if blurb_info:
@@ -213,17 +290,17 @@ def build_movies_from_texts(
                 "blurb": blurb_info.get("blurb"),
                 "source": "pdf",
             })
-        elif tmdb_info:
+        elif tmdb_key:
             entry.update({
-                "director": tmdb_info.get("director"),
-                "cast": tmdb_info.get("cast"),
-                "genre": tmdb_info.get("genre"),
-                "duration": tmdb_info.get("duration"),
-                "blurb": tmdb_info.get("blurb"),
-                "release_date": tmdb_info.get("release_date"),
-                "poster_url": tmdb_info.get("poster_url"),
-                "poster_url_w780": tmdb_info.get("poster_url_w780"),
-                "backdrop_url": tmdb_info.get("backdrop_url"),
+                "director": tmdb_info.director,
+                "cast": tmdb_info.cast,
+                "genre": tmdb_info.genre,
+                "duration": tmdb_info.duration,
+                "blurb": tmdb_info.blurb,
+                "release_date": tmdb_info.release_date,
+                "poster_url": tmdb_info.poster_url,
+                "poster_url_w780": tmdb_info.poster_url_w780,
+                "backdrop_url": tmdb_info.backdrop_url,
                 "source": "tmdb",
             })
         movies.append(entry)
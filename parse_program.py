@@ -15,11 +15,11 @@ import json
 import os
 from dataclasses import replace
 from typing import Any, Dict, List, Optional, Tuple
-from api_clients import fetch_tmdb_details
+from api_clients import TmdbDetails, fetch_tmdb_details_many
 from ocr.mistral import extract_raw_texts
-from parsing.screenings import parse_screenings, screenings_to_records
+from parsing.screenings import Screening, parse_screenings, screenings_to_records
 from rules.rules import Rules, ScreeningRecord, apply_rules, load_rules
-from movies.blurbs import build_movies_from_texts
+from movies.blurbs import build_movies_from_texts, match_movie_blurbs, screening_titles
 from typography import normalize_french_typography
 
 PDF_PATH = "INTERNET-MORVAN.pdf"  # adjust if needed
@@ -54,27 +54,28 @@ def build_screenings_from_texts(
     texts: List[str],
     tmdb_key: str,
     rules: Rules,
+    screenings: Optional[List[Screening]] = None,
+    tmdb_details: Optional[Dict[str, TmdbDetails]] = None,
 ) -> List[Dict[str, Any]]:
-    screenings = parse_screenings(texts)
+    if screenings is None:
+        screenings = parse_screenings(texts)
     records = screenings_to_records(screenings)
 
     if not tmdb_key:
         records = apply_rules(records, rules)
         return records_to_dicts(records, include_tmdb=False)
 
-    info_cache: Dict[str, Dict[str, Optional[str]]] = {}
+    if tmdb_details is None:
+        tmdb_details = fetch_tmdb_details_many((r.movie_title or "" for r in records), tmdb_key)
     enriched: List[ScreeningRecord] = []
     for record in records:
-        title = record.movie_title or ""
-        if title not in info_cache:
-            info_cache[title] = fetch_tmdb_details(title, tmdb_key)
-        info = info_cache[title]
+        info = tmdb_details.get(record.movie_title or "") or TmdbDetails()
         enriched.append(
             replace(
                 record,
-                original_title=info.get("original_title"),
-                original_language=info.get("original_language"),
-                yt_trailer_url=info.get("yt_trailer_url"),
+                original_title=info.original_title,
+                original_language=info.original_language,
+                yt_trailer_url=info.yt_trailer_url,
             )
         )
 
@@ -89,13 +90,26 @@ def extract_screenings(pdf_path: str) -> List[Dict[str, Any]]:
     return build_screenings_from_texts(texts, tmdb_key, rules)
 
 
-def extract_all(pdf_path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+def extract_all(
+    pdf_path: str,
+    use_tmdb: bool = True,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     texts = normalize_texts(extract_raw_texts(pdf_path))
     screenings = parse_screenings(texts)
-    tmdb_key = os.getenv("TMDB_API_KEY", "").strip()
+    # Without a key, both passes skip TMDB and emit PDF-only data.
+    tmdb_key = os.getenv("TMDB_API_KEY", "").strip() if use_tmdb else ""
     rules = load_rules("rules.json")
-    screenings_out = build_screenings_from_texts(texts, tmdb_key, rules)
-    movies_out = build_movies_from_texts(texts, screenings, tmdb_key)
+
+    # One TMDB pass serves both outputs. Credits are only needed for titles
+    # without a PDF blurb, so the others skip them.
+    titles = screening_titles(screenings)
+    matched_blurbs = match_movie_blurbs(texts, titles)
+    tmdb_details: Dict[str, TmdbDetails] = {}
+    if tmdb_key:
+        tmdb_details = fetch_tmdb_details_many(titles, tmdb_key, without_credits=matched_blurbs.keys())
+
+    screenings_out = build_screenings_from_texts(texts, tmdb_key, rules, screenings, tmdb_details)
+    movies_out = build_movies_from_texts(texts, screenings, tmdb_key, matched_blurbs, tmdb_details)
     return screenings_out, movies_out
 
 
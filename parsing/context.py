@@ -3,9 +3,11 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 WEEKDAY_RE = re.compile(r"\b(MER|JEU|VEN|SAM|DIM|LUN|MAR)\b", re.IGNORECASE)
+WEEKDAY_TOKENS = ("MER", "JEU", "VEN", "SAM", "DIM", "LUN", "MAR")
 DAYNUM_RE = re.compile(r"\b([0-3]?\d)\b")
 
 MONTH_MAP = {
@@ -40,10 +42,25 @@ class ParseContext:
             self.col_idx_to_iso = {}
 
 
+def has_weekday(text: str) -> bool:
+    if not text:
+        return False
+    # Substring scan first; most cells hold no weekday at all. The regex then
+    # enforces word boundaries ("MAR" but not "MARS").
+    upper = text.upper()
+    if not any(token in upper for token in WEEKDAY_TOKENS):
+        return False
+    return WEEKDAY_RE.search(text) is not None
+
+
 def infer_month_from_week_range(text: str) -> Optional[int]:
     if not text:
         return None
-    m = WEEK_RANGE_RE.search(text.upper())
+    upper = text.upper()
+    # Literal prefilter: almost no OCR line is a "DU .. AU .." week header.
+    if "DU" not in upper or "AU" not in upper:
+        return None
+    m = WEEK_RANGE_RE.search(upper)
     if not m:
         return None
     token = m.group(1)
@@ -56,7 +73,7 @@ def parse_header_cells_to_daynums(header_row_texts: List[str]) -> List[Optional[
         if not t:
             out.append(None)
             continue
-        if not WEEKDAY_RE.search(t):
+        if not has_weekday(t):
             out.append(None)
             continue
         m = DAYNUM_RE.search(t)
@@ -64,6 +81,15 @@ def parse_header_cells_to_daynums(header_row_texts: List[str]) -> List[Optional[
     return out
 
 
+@lru_cache(maxsize=1024)
+def _iso_date(year: int, month: int, day: int) -> Optional[str]:
+    # Each (year, month, day) recurs for every cinema and week table.
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
 def daynums_to_dates(
     daynums: List[Optional[int]],
     year: int,
@@ -90,10 +116,10 @@ def daynums_to_dates(
             m = prev_month
         else:
             m = month
-        try:
-            idx_to_iso[idx] = date(year, m, n).isoformat()
-        except ValueError:
+        iso = _iso_date(year, m, n)
+        if iso is None:
             # Lossless handling: skip invalid day/month combos from OCR noise.
             continue
+        idx_to_iso[idx] = iso
 
     return idx_to_iso
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
 from parsing.context import (
     ParseContext,
-    WEEKDAY_RE,
+    has_weekday,
     infer_month_from_week_range,
     parse_header_cells_to_daynums,
     daynums_to_dates,
@@ -16,8 +17,21 @@ from rules.rules import ScreeningRecord
 
 DEFAULT_YEAR = 2025
 
+# Checked in order; the first keyword found decides the cinema.
+_CINEMA_KEYWORDS = (
+    ("LUZY", "LUZY – Le Vox"),
+    ("CHATEAU", "CHÂTEAU-CHINON – L’Étoile"),
+    ("CHÂTEAU", "CHÂTEAU-CHINON – L’Étoile"),
+    ("OUROUX", "OUROUX-EN-MORVAN – Le Clap"),
+    ("MORVAN", "OUROUX-EN-MORVAN – Le Clap"),
+    ("BAINS", "SAINT-HONORÉ-LES-BAINS – Le Sélect"),
+)
+_SPACES_RE = re.compile(r"\s+")
+# Trailing duration glued to a title cell, e.g. "Film - 1h45 ...".
+_TITLE_DURATION_TAIL_RE = re.compile(r"\s*-\s*\d+h\d{2}\b.*$")
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Screening:
     cinema: str
     movie_title: str
@@ -30,26 +44,22 @@ def normalize_cinema(raw: str) -> Optional[str]:
     if not raw:
         return None
 
+    # Keywords are plain letters, so stripping punctuation first never changes
+    # whether one occurs; scan the uppercased text directly.
     t = raw.upper()
-    t = re.sub(r"[^A-ZÀ-ÖØ-Ý ]+", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
-
-    if "LUZY" in t:
-        return "LUZY – Le Vox"
-    if "CHATEAU" in t or "CHÂTEAU" in t:
-        return "CHÂTEAU-CHINON – L’Étoile"
-    if "OUROUX" in t or "MORVAN" in t:
-        return "OUROUX-EN-MORVAN – Le Clap"
-    if "BAINS" in t:
-        return "SAINT-HONORÉ-LES-BAINS – Le Sélect"
+    for keyword, cinema in _CINEMA_KEYWORDS:
+        if keyword in t:
+            return cinema
 
     return None
 
 
+@lru_cache(maxsize=2048)
 def normalize_title(raw: str) -> str:
+    # The same title cell recurs for every week and cinema it is shown in.
     t = (raw or "").strip()
-    t = re.sub(r"\s*-\s*\d+h\d{2}\b.*$", "", t).strip()
-    t = re.sub(r"\s+", " ", t)
+    t = _TITLE_DURATION_TAIL_RE.sub("", t).strip()
+    t = _SPACES_RE.sub(" ", t)
     return t
 
 
@@ -69,12 +79,14 @@ def _update_context_from_row(
     context: ParseContext,
     year: int,
 ) -> Optional[Dict[int, str]]:
-    row_joined = " ".join(row)
-    month_from_row = infer_month_from_week_range(row_joined)
-    if month_from_row:
-        context.current_month = month_from_row
-
-    if any(WEEKDAY_RE.search(c or "") for c in row):
+    # A "DU .. AU .." header lives in a single cell; no need to join the row.
+    for cell in row:
+        month_from_cell = infer_month_from_week_range(cell)
+        if month_from_cell:
+            context.current_month = month_from_cell
+            break
+
+    if any(has_weekday(c) for c in row):
         daynums = parse_header_cells_to_daynums(row)
         if context.current_month is None:
             return {}
@@ -94,8 +106,11 @@ def _parse_screenings_from_row(
         return []
 
     results: List[Screening] = []
-    for col_idx in range(1, len(row)):
-        if col_idx not in context.col_idx_to_iso:
+    row_len = len(row)
+    # Walk only the dated columns. daynums_to_dates fills the mapping in column
+    # order, so screenings still come out left to right. Column 0 is the title.
+    for col_idx, iso_date in context.col_idx_to_iso.items():
+        if col_idx < 1 or col_idx >= row_len:
             continue
         cell_text = row[col_idx].strip()
         if not cell_text:
@@ -103,7 +118,6 @@ def _parse_screenings_from_row(
         times = parse_time_cell(cell_text)
         if not times:
             continue
-        iso_date = context.col_idx_to_iso[col_idx]
         for time_str, version in times:
             results.append(
                 Screening(
@@ -118,7 +132,9 @@ def _parse_screenings_from_row(
 
 
 def process_tables(texts: List[str], year: int) -> List[Screening]:
-    results: List[Screening] = []
+    # OCR repeats rows (reprinted tables, split pages); dedupe as we go while
+    # keeping first-seen order. Screening is frozen, so it is its own key.
+    results: Dict[Screening, None] = {}
 
     context = ParseContext()
 
@@ -146,14 +162,12 @@ def process_tables(texts: List[str], year: int) -> List[Screening]:
                 context.col_idx_to_iso = maybe_idx_to_iso
                 continue
 
-            maybe_cinema = normalize_cinema(row[0]) if row else None
-            if maybe_cinema:
-                context.current_cinema = maybe_cinema
-                continue
-
-            results.extend(_parse_screenings_from_row(row, context))
+            # No need to retry normalize_cinema on row[0]: the first cell is
+            # part of the line, which has already been checked.
+            for screening in _parse_screenings_from_row(row, context):
+                results[screening] = None
 
-    return results
+    return list(results)
 
 
 def parse_screenings(texts: List[str]) -> List[Screening]:
@@ -161,10 +175,9 @@ def parse_screenings(texts: List[str]) -> List[Screening]:
 
 
 def screenings_to_records(screenings: List[Screening]) -> List[ScreeningRecord]:
-    uniq: Dict[Tuple[str, str, str, str, Optional[str]], Screening] = {}
-    for s in screenings:
-        key = (s.cinema, s.movie_title, s.date, s.time, s.version)
-        uniq[key] = s
+    # Screening is frozen, so it hashes on all its fields; dict.fromkeys
+    # dedupes while keeping first-seen order, unlike a set.
+    uniq = dict.fromkeys(screenings)
     return [
         ScreeningRecord(
             cinema=s.cinema,
@@ -173,5 +186,5 @@ def screenings_to_records(screenings: List[Screening]) -> List[ScreeningRecord]:
             time=s.time,
             version=s.version,
         )
-        for s in uniq.values()
+        for s in uniq
     ]
@@ -6,12 +6,25 @@ from typing import Iterable, List, Optional, Tuple
 TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)+\|?\s*$")
 TIME_RE = re.compile(r"\b(\d{1,2})\s*[hH]\s*(\d{2})?\b")
 VERSION_RE = re.compile(r"\b(VOST|VF)\b", re.IGNORECASE)
+# parse_time_cell uppercases first, so it can skip case folding while matching.
+_UPPER_VERSION_RE = re.compile(r"\b(VOST|VF)\b")
+
+
+def _is_separator_line(line: str) -> bool:
+    # A separator row must open with "-" or ":-" once the optional leading
+    # pipe is skipped; data rows fail this before reaching the regex.
+    head = line.lstrip()
+    if head.startswith("|"):
+        head = head[1:].lstrip()
+    if not head.startswith(("-", ":-")):
+        return False
+    return TABLE_SEPARATOR_RE.match(line) is not None
 
 
 def is_table_line(line: str) -> bool:
     if "|" not in line:
         return False
-    if TABLE_SEPARATOR_RE.match(line):
+    if _is_separator_line(line):
         return False
     return True
 
@@ -30,6 +43,10 @@ def iter_lines_with_rows(page_text: str) -> Iterable[Tuple[str, Optional[List[st
         line = (raw_line or "").strip()
         if not line:
             continue
+        if "|" not in line:
+            # Prose, headings and cinema names: most lines are not table rows.
+            yield line, None
+            continue
         yield line, parse_table_line(line)
 
 
@@ -47,21 +64,19 @@ def parse_time_cell(cell_text: str) -> List[Tuple[str, Optional[str]]]:
     t = cell_text.upper().replace("*", " ")
 
     times: List[Tuple[str, Optional[str]]] = []
+    search_version = _UPPER_VERSION_RE.search
     for m in TIME_RE.finditer(t):
         time_str = _format_time(m.group(1), m.group(2))
-        version: Optional[str] = None
-
-        # Prefer an explicit version immediately after the time (e.g. "20h VOST")
-        after = t[m.end():m.end() + 8]
-        after_match = VERSION_RE.search(after)
-        if after_match:
-            version = after_match.group(1)
-        else:
-            # Or immediately before the time (e.g. "VOST 20h")
-            before = t[max(0, m.start() - 8):m.start()]
-            before_match = VERSION_RE.search(before)
-            if before_match:
-                version = before_match.group(1)
+        start, end = m.span()
+
+        # Prefer an explicit version immediately after the time (e.g. "20h VOST").
+        # endpos acts like the end of a slice for \b, so no copy is needed.
+        version_match = search_version(t, end, end + 8)
+        if version_match is None:
+            # Or immediately before the time (e.g. "VOST 20h"). This one stays a
+            # slice: a search pos would not treat the window start as a boundary.
+            version_match = search_version(t[max(0, start - 8):start])
+        version = version_match.group(1) if version_match else None
 
         times.append((time_str, version))
 
@@ -5,7 +5,7 @@ from dataclasses import dataclass, replace
 from typing import Any, Dict, List, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScreeningRecord:
     cinema: str
     movie_title: str
@@ -17,7 +17,7 @@ class ScreeningRecord:
     yt_trailer_url: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rules:
     cinema_aliases: Dict[str, str]
     title_fixes: Dict[str, str]
@@ -35,18 +35,27 @@ def load_rules(path: str) -> Rules:
 
 
 def apply_rules(records: List[ScreeningRecord], rules: Rules) -> List[ScreeningRecord]:
+    cinema_aliases = rules.cinema_aliases
+    title_fixes = rules.title_fixes
+    set_vf = bool(rules.version_rules.get("set_vf_if_original_language_not_fr_and_not_vost"))
+
     updated: List[ScreeningRecord] = []
     for record in records:
-        cinema = rules.cinema_aliases.get(record.cinema, record.cinema)
-        title = rules.title_fixes.get(record.movie_title, record.movie_title)
+        cinema = cinema_aliases.get(record.cinema, record.cinema)
+        title = title_fixes.get(record.movie_title, record.movie_title)
         version = record.version
 
-        if rules.version_rules.get("set_vf_if_original_language_not_fr_and_not_vost"):
+        if set_vf:
             original_language = (record.original_language or "").lower()
             current_version = (version or "").upper()
             if original_language and original_language != "fr" and current_version != "VOST":
                 version = "VF"
 
+        if cinema == record.cinema and title == record.movie_title and version == record.version:
+            # Records are frozen, so an untouched one can be shared as is.
+            updated.append(record)
+            continue
+
         updated.append(
             replace(
                 record,
@@ -3,42 +3,88 @@
 
 from __future__ import annotations
 
+import argparse
 import json
+import re
 from datetime import datetime, timezone
 from pathlib import Path
 import sys
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from parse_program import extract_all, PDF_PATH
 
+_STAMP_LINE_RE = re.compile(rb'window\.PROGRAM_LAST_UPDATED = "[^"\n]*";')
 
-def main() -> int:
-    pdf_path = sys.argv[1] if len(sys.argv) > 1 else PDF_PATH
-    screenings, movies = extract_all(pdf_path)
 
-    stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+def dump_json(payload: Any, compact: bool = False) -> bytes:
+    if orjson is not None:
+        # orjson's output matches json's for these options (UTF-8, no ASCII
+        # escaping) and is built in C.
+        return orjson.dumps(payload, option=0 if compact else orjson.OPT_INDENT_2)
+    if compact:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(payload, ensure_ascii=False, indent=2)
+    return text.encode("utf-8")
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    # Unchanged outputs are left alone: no rewrite, no spurious git diff.
+    try:
+        if path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(content)
+    return True
+
+
+def program_unchanged(path: Path, program: bytes) -> bool:
+    # data.js is the timestamp line followed by the program itself. Anything
+    # else (a hand-edited header, extra lines) counts as changed and gets
+    # rewritten, so a stale stamp is never kept by mistake.
+    try:
+        head, _, rest = path.read_bytes().partition(b"\n")
+    except FileNotFoundError:
+        return False
+    return _STAMP_LINE_RE.fullmatch(head) is not None and rest == program
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf_path", nargs="?", default=PDF_PATH)
+    parser.add_argument(
+        "--no-tmdb",
+        action="store_true",
+        help="skip TMDB lookups (no original titles, trailers or posters)",
+    )
+    args = parser.parse_args()
+    screenings, movies = extract_all(args.pdf_path, use_tmdb=not args.no_tmdb)
 
     data_path = Path("data.js")
     movies_path = Path("movies.json")
     movies_js_path = Path("movies.js")
 
-    data_path.write_text(
-        "window.PROGRAM_LAST_UPDATED = \"" + stamp + "\";\n" +
-        "window.PROGRAM = " + json.dumps(screenings, ensure_ascii=False, indent=2) + ";\n",
-        encoding="utf-8",
-    )
+    program = b"window.PROGRAM = " + dump_json(screenings) + b";\n"
+    # The timestamp only moves when the program itself changes.
+    if not program_unchanged(data_path, program):
+        stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        data_path.write_bytes(
+            b"window.PROGRAM_LAST_UPDATED = \"" + stamp.encode("ascii") + b"\";\n" + program
+        )
 
-    movies_path.write_text(
-        json.dumps(movies, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
-
-    movies_js_path.write_text(
-        "window.MOVIES = " + json.dumps(movies, ensure_ascii=False, indent=2) + ";\n",
-        encoding="utf-8",
-    )
+    write_if_changed(movies_path, dump_json(movies) + b"\n")
+    # movies.js only mirrors movies.json for file:// pages, so it is not meant
+    # to be read; data.js stays indented as it is also edited by hand.
+    write_if_changed(movies_js_path, b"window.MOVIES = " + dump_json(movies, compact=True) + b";\n")
 
     return 0
 
@@ -0,0 +1,73 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import extract_month
+
+
+OLD_STAMP = 'window.PROGRAM_LAST_UPDATED = "2000-01-01T00:00:00+00:00";\n'
+SCREENINGS = [{"cinema": "LUZY – Le Vox", "movie_title": "Film", "date": "2025-12-24", "time": "20h30"}]
+MOVIES = [{"movie_title": "Film", "source": "pdf"}]
+
+
+@pytest.fixture
+def run(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["extract_month.py", "programme.pdf"])
+
+    def run_with(screenings):
+        monkeypatch.setattr(extract_month, "extract_all", lambda *_a, **_k: (screenings, MOVIES))
+        assert extract_month.main() == 0
+
+    return run_with
+
+
+def _program(screenings):
+    return (b"window.PROGRAM = " + extract_month.dump_json(screenings) + b";\n").decode("utf-8")
+
+
+def test_missing_outputs_are_written(run, tmp_path):
+    run(SCREENINGS)
+    data = (tmp_path / "data.js").read_text(encoding="utf-8")
+    assert data.startswith("window.PROGRAM_LAST_UPDATED = ")
+    assert data.endswith(_program(SCREENINGS))
+    assert (tmp_path / "movies.json").exists()
+    assert (tmp_path / "movies.js").exists()
+
+
+def test_unchanged_outputs_are_left_alone(run, tmp_path):
+    run(SCREENINGS)
+    data_path = tmp_path / "data.js"
+    data_path.write_text(OLD_STAMP + _program(SCREENINGS), encoding="utf-8")
+    paths = [data_path, tmp_path / "movies.json", tmp_path / "movies.js"]
+    for path in paths:
+        os.utime(path, ns=(10**18, 10**18))
+
+    run(SCREENINGS)
+    assert data_path.read_text(encoding="utf-8").startswith(OLD_STAMP)
+    assert [path.stat().st_mtime_ns for path in paths] == [10**18] * 3
+
+
+def test_changed_program_bumps_the_stamp(run, tmp_path):
+    data_path = tmp_path / "data.js"
+    data_path.write_text(OLD_STAMP + _program(SCREENINGS), encoding="utf-8")
+
+    changed = [{**SCREENINGS[0], "time": "18h"}]
+    run(changed)
+    data = data_path.read_text(encoding="utf-8")
+    assert not data.startswith(OLD_STAMP)
+    assert data.endswith(_program(changed))
+
+
+def test_hand_edited_header_is_rewritten(run, tmp_path):
+    data_path = tmp_path / "data.js"
+    data_path.write_text("window.PROGRAM_LAST_UPDATED = null; // edited\n" + _program(SCREENINGS), encoding="utf-8")
+
+    run(SCREENINGS)
+    head = data_path.read_text(encoding="utf-8").partition("\n")[0]
+    assert extract_month._STAMP_LINE_RE.fullmatch(head.encode("utf-8"))
@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from movies import blurbs
+
+
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+def test_best_match_title_is_backend_independent(monkeypatch, use_rapidfuzz):
+    if use_rapidfuzz:
+        pytest.importorskip("rapidfuzz")
+    else:
+        monkeypatch.setattr(blurbs, "fuzz", None)
+    candidates = blurbs._normalize_candidates(["GAREEDE", "CHASSE GARDÉE 2", "LA NUIT"])
+
+    # difflib scores "gardee de"/"gareede" 0.625, RapidFuzz's Indel ratio 0.875.
+    assert blurbs._best_match_title("gardee de", candidates[:1]) is None
+    assert blurbs._best_match_title("Chasse gardee 2", candidates) == "CHASSE GARDÉE 2"
+    assert blurbs._best_match_title("Chasse garde 2", candidates) == "CHASSE GARDÉE 2"
+    assert blurbs._best_match_title("Le jour", candidates) is None
@@ -2,6 +2,8 @@ import json
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
@@ -12,12 +14,45 @@ from ocr import mistral
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-def test_parse_program_smoke(monkeypatch):
-    sample_ocr = json.loads((FIXTURES_DIR / "sample_ocr.json").read_text())
-    expected = json.loads((FIXTURES_DIR / "expected_output.json").read_text())
+@pytest.fixture(scope="session")
+def sample_ocr():
+    return json.loads((FIXTURES_DIR / "sample_ocr.json").read_text())
+
+
+@pytest.fixture(scope="session")
+def expected():
+    return json.loads((FIXTURES_DIR / "expected_output.json").read_text())
+
 
+def test_parse_program_smoke(monkeypatch, sample_ocr, expected):
     monkeypatch.setenv("TMDB_API_KEY", "")
     monkeypatch.setattr(mistral, "call_mistral_ocr", lambda _path: sample_ocr)
 
     result = pp.extract_screenings("sample.pdf")
     assert result == expected
+
+
+def test_extract_all_fetches_tmdb_once_per_title(monkeypatch, sample_ocr):
+    import api_clients
+
+    monkeypatch.setenv("TMDB_API_KEY", "key")
+    monkeypatch.setenv(api_clients.TMDB_CACHE_TTL_ENV, "0")
+    monkeypatch.setattr(mistral, "call_mistral_ocr", lambda _path: sample_ocr)
+    searches = []
+    details = []
+
+    def fake_get(url):
+        if "/search/" in url:
+            searches.append(url)
+            return {"results": [{"id": len(searches), "original_title": "Film"}]}
+        details.append(url)
+        return {"runtime": 90}
+
+    monkeypatch.setattr(api_clients, "_http_get_json", fake_get)
+    screenings, movies = pp.extract_all("sample.pdf")
+
+    assert len(searches) == len(movies)
+    assert all(s["original_title"] == "Film" for s in screenings)
+    with_blurb = sum(m["source"] == "pdf" for m in movies)
+    assert with_blurb
+    assert sum("credits" not in url for url in details) == with_blurb
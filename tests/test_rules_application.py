@@ -49,3 +49,15 @@ def test_apply_rules_version_from_original_language():
     )
     updated = apply_rules([record], rules)[0]
     assert updated.version == "VF"
+
+
+def test_apply_rules_reuses_unchanged_records():
+    rules = Rules(cinema_aliases={"LUZY": "LUZY – Le Vox"}, title_fixes={}, version_rules={})
+    record = ScreeningRecord(
+        cinema="LUZY – Le Vox",
+        movie_title="Film",
+        date="2025-12-24",
+        time="20h",
+        version="VF",
+    )
+    assert apply_rules([record], rules)[0] is record
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from typography import normalize_french_typography
+
+
+# Expected values come from the original four-regex implementation.
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("« ;", "«\u202f;"),
+        ("«;", "«\u202f;"),
+        ("«\u202f?", "«\u202f?"),
+        ("a « » b", "a «\u202f» b"),
+        ("&amp;;", "&\u202f;"),
+        ("A &amp;; B", "A &\u202f; B"),
+        ("&amp;amp;", "&amp\u202f;"),
+        (";début", ";début"),
+        ("  ? question", "  ? question"),
+        ("!", "!"),
+        ("…?", "…\u202f?"),
+        ("Fin .... ", "Fin …. "),
+        ("Quoi \u00a0\u202f ?", "Quoi\u202f?"),
+        ("«\u00a0\u202f Salut \u202f\u00a0»", "«\u202fSalut\u202f»"),
+        ("x\u00a0:\u00a0y", "x\u202f:\u00a0y"),
+    ],
+)
+def test_normalize_french_typography(text, expected):
+    assert normalize_french_typography(text) == expected
+    # Idempotent on its own output.
+    assert normalize_french_typography(expected) == expected
@@ -5,37 +5,19 @@ import re
 # Narrow no-break space used by French typography.
 NARROW_NBSP = "\u202F"
 
-# Matches any regular or non-breaking space.
-_SPACE_RE = re.compile(r"[ \u00A0\u202F]+")
+# Spaces that French punctuation spacing replaces (regular, NBSP, narrow NBSP).
+_SPACES = " \u00A0\u202F"
 
 # Punctuation that should be preceded by a narrow no-break space in French.
-_FRENCH_PUNCT_RE = re.compile(r"[;:!?»]")
+_FRENCH_PUNCT = ";:!?»"
 
-# Insert/normalize a narrow no-break space after the opening guillemet.
-_AFTER_OPEN_QUOTE_RE = re.compile(r"«[ \u00A0\u202F]*")
+# The characters whose surrounding spaces get normalized, found in one
+# left-to-right scan; the spaces themselves are handled while joining.
+_SPACING_RE = re.compile(r"[«;:!?»]")
 
-# Normalize runs of three dots into an ellipsis character.
-_ELLIPSIS_RE = re.compile(r"\.\.\.")
-
-
-def _normalize_space_before_punct(text: str) -> str:
-    # Ensure French punctuation is preceded by a narrow no-break space.
-    # This replaces any existing spaces (regular or NBSP) before ;:!?».
-    result = []
-    i = 0
-    for match in re.finditer(r"[ \u00A0\u202F]*[;:!?»]", text):
-        start = match.start()
-        end = match.end()
-        punct = text[end - 1]
-        if start == 0:
-            # Do not insert a leading space at the very beginning of the string.
-            result.append(text[i:end])
-        else:
-            result.append(text[i:start])
-            result.append(NARROW_NBSP + punct)
-        i = end
-    result.append(text[i:])
-    return "".join(result)
+# First characters of everything this module rewrites; text without any of
+# them is returned as is.
+_TRIGGER_RE = re.compile(r"[&.«;:!?»]")
 
 
 def normalize_french_typography(text: str) -> str:
@@ -47,24 +29,51 @@ def normalize_french_typography(text: str) -> str:
     - Keep apostrophes and straight quotes untouched
     - Idempotent and safe for already-normalized text
     """
-    if not text:
+    if not text or not _TRIGGER_RE.search(text):
         return text
 
-    # Decode common HTML entity before punctuation spacing normalization.
-    # Prevents '&amp;' from turning into '&\u202F;'.
-    text = text.replace("&amp;", "&")
-
-    # Normalize three dots into a single ellipsis character.
-    text = _ELLIPSIS_RE.sub("…", text)
+    # Literal rewrites go through str.replace, which beats the regex engine.
+    # &amp; is decoded first so its ";" never gets a space before it.
+    if "&amp;" in text:
+        text = text.replace("&amp;", "&")
+    if "..." in text:
+        text = text.replace("...", "…")
 
-    # Insert/normalize spacing after opening guillemet.
-    # French typography requires a narrow no-break space after «.
-    text = _AFTER_OPEN_QUOTE_RE.sub("«" + NARROW_NBSP, text)
-
-    # Ensure proper narrow no-break space before French punctuation.
-    text = _normalize_space_before_punct(text)
-
-    return text
+    result = []
+    i = 0  # end of the input already copied or rewritten
+    n = len(text)
+    for match in _SPACING_RE.finditer(text):
+        start, end = match.span()
+        token = match.group()
+        if token == "«":
+            # French typography requires a narrow no-break space after «.
+            j = end
+            while j < n and text[j] in _SPACES:
+                j += 1
+            result.append(text[i:start])
+            if j < n and text[j] in _FRENCH_PUNCT:
+                # The punctuation branch below spaces it, absorbing these spaces.
+                result.append("«")
+            else:
+                result.append("«" + NARROW_NBSP)
+                end = j
+        else:
+            # Replace any spaces (regular or NBSP) before ;:!?».
+            space_start = start
+            while space_start > i and text[space_start - 1] in _SPACES:
+                space_start -= 1
+            if space_start == 0:
+                # Do not insert a leading space at the very beginning of the string.
+                result.append(text[:end])
+            else:
+                result.append(text[i:space_start])
+                result.append(NARROW_NBSP + token)
+        i = end
+    if not result:
+        # Nothing to space (the common case for titles): skip the copy.
+        return text
+    result.append(text[i:])
+    return "".join(result)
 
 
 if __name__ == "__main__":